@@ -2,21 +2,29 @@ from app.app_env import app_env
 from typing import Any, Dict, List, Optional
 
 try:
-    from langchain_neo4j import Neo4jGraph
+    from neo4j import GraphDatabase
 except ImportError:
-    raise ImportError("langchain_neo4j is not installed. Please install it using pip install langchain_neo4j")
+    raise ImportError("neo4j is not installed. Please install it using pip install neo4j")
 
 from app.interfaces.graph_db_interface import GraphDBInterface
 
 
 class Neo4jAdapter(GraphDBInterface):
     def __init__(self, url: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None, database: Optional[str] = None):
-        self._graph = Neo4jGraph(
-            url=url or app_env.NEO4J_URL,
-            username=username or app_env.NEO4J_USER,
-            password=password or app_env.NEO4J_PWD.get_secret_value(),
-            database=database or app_env.NEO4J_DATABASE
+        # Talk to the driver directly: Neo4jGraph introspects the schema (APOC) on construction
+        # and post-processes every result, none of which the memory tools use.
+        # One driver per process with a bounded pool, however many threads issue queries.
+        self._driver = GraphDatabase.driver(
+            url or app_env.NEO4J_URL,
+            auth=(username or app_env.NEO4J_USER, password or app_env.NEO4J_PWD.get_secret_value()),
+            max_connection_pool_size=app_env.NEO4J_MAX_CONNECTION_POOL_SIZE,
         )
+        # Fail at startup on a bad URL or credentials, as Neo4jGraph did, not on the first query.
+        self._driver.verify_connectivity()
+        self._database = database or app_env.NEO4J_DATABASE
 
     def query(self, cypher_query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        return self._graph.query(cypher_query, params or {})
+        # execute_query runs in a managed transaction, so transient errors (leader switch,
+        # dropped connection) are retried by the driver.
+        records, _, _ = self._driver.execute_query(cypher_query, parameters_=params or {}, database_=self._database)
+        return [record.data() for record in records]
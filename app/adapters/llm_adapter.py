@@ -1,38 +1,137 @@
+import atexit
+import socket
+from functools import lru_cache
+
 from app.app_env import app_env
+from app.settings import LLM_PROVIDER
+
+# Providers are built on first use rather than at import time, so modules that never call an
+# LLM don't pay for SDK/client construction. `search_llm_provider` and `llm_provider` remain
+# importable as module attributes (resolved lazily through __getattr__ below).
+
+# Connection pool shared by every provider client: keeps TLS connections alive between agent
+# turns and lets concurrent tool/LLM calls multiplex over HTTP/2 instead of re-handshaking.
+_HTTP_POOL_LIMITS = {"max_connections": 64, "max_keepalive_connections": 32}
+
+# Disable Nagle so small completion requests aren't held back waiting on ACKs, and send TCP
+# keepalives on idle pooled sockets so load balancers don't silently drop them between turns.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux; not exposed on macOS/Windows
+    _SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 30),
+    ]
+
+
+@lru_cache(maxsize=1)
+def _get_http_client():
+    import httpx
+    client = httpx.Client(
+        transport=httpx.HTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(**_HTTP_POOL_LIMITS),
+            socket_options=_SOCKET_OPTIONS,
+        )
+    )
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _get_async_http_client():
+    # Not closed explicitly: there is no event loop left at interpreter exit, and the OS reclaims the sockets.
+    import httpx
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(**_HTTP_POOL_LIMITS),
+            socket_options=_SOCKET_OPTIONS,
+        )
+    )
+
+
+def _make_openai():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        temperature=0,
+        model=app_env.OPENAI_LLM_MODEL,
+        api_key=app_env.OPENAI_API_KEY.get_secret_value(),
+        verbose=False,
+        streaming=True,
+        http_client=_get_http_client(),
+        http_async_client=_get_async_http_client()
+    )
+
+
+def _make_openrouter():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        temperature=0,
+        model=app_env.OPENROUTER_LLM_MODEL,
+        base_url=str(app_env.OPENROUTER_BASE_URL),
+        api_key=app_env.OPENROUTER_API_KEY.get_secret_value() if app_env.OPENROUTER_API_KEY else None,
+        streaming=True,
+        http_client=_get_http_client(),
+        http_async_client=_get_async_http_client()
+    )
+
+
+def _make_togetherai():
+    from langchain_together import ChatTogether
+    return ChatTogether(
+        temperature=0,
+        model=app_env.TOGETHER_AI_LLM_MODEL,
+        api_key=app_env.TOGETHER_AI_API_KEY.get_secret_value() if app_env.TOGETHER_AI_API_KEY else None,
+        streaming=True,
+        http_client=_get_http_client(),
+        http_async_client=_get_async_http_client()
+    )
+
+
+def _make_groq():
+    from langchain_groq import ChatGroq
+    return ChatGroq(
+        model=app_env.GROQ_LLM_MODEL if app_env.GROQ_LLM_MODEL else "llama3-70b-8192",  # Default if not set
+        temperature=0,
+        streaming=True,
+        api_key=app_env.GROQ_API_KEY.get_secret_value() if app_env.GROQ_API_KEY else None,
+        http_client=_get_http_client(),
+        http_async_client=_get_async_http_client()
+    )
+
+
+_LLM_FACTORIES = {
+    "openai": _make_openai,
+    "openrouter": _make_openrouter,
+    "togetherai": _make_togetherai,
+    "groq": _make_groq,
+}
+
+
+@lru_cache(maxsize=1)
+def get_search_llm():
+    """The agent's main model, chosen by settings.LLM_PROVIDER."""
+    try:
+        factory = _LLM_FACTORIES[LLM_PROVIDER]
+    except KeyError:
+        raise ValueError(f"Unsupported LLM_PROVIDER '{LLM_PROVIDER}'. Options: {', '.join(_LLM_FACTORIES)}")
+    return factory()
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """The model used for relation extraction while building graph memories."""
+    return _make_groq()
+
 
-# OPENAI
-from langchain_openai import ChatOpenAI
-search_llm_provider = ChatOpenAI(
-    temperature=0,
-    model=app_env.OPENAI_LLM_MODEL,
-    api_key=app_env.OPENAI_API_KEY.get_secret_value(),
-    verbose=False,
-    streaming=True
-)
-
-# OLLAMA
-# from langchain_ollama import ChatOllama
-# llm_provider = ChatOllama(model="model name")
-
-# OPENROUTER
-# llm_provider = ChatOpenAI(temperature=0, model=app_env.OPENROUTER_LLM_MODEL, base_url=str(app_env.OPENROUTER_BASE_URL), api_key=app_env.OPENROUTER_API_KEY.get_secret_value() if app_env.OPENROUTER_API_KEY else None)
-
-
-# TOGETHER AI
-# from langchain_together import ChatTogether
-# llm_provider = ChatTogether(
-#     together_api_key=togetherai_api_key,
-#     model=together_llm_model,
-#     api_key=app_env.TOGETHERAI_API_KEY.get_secret_value() if app_env.TOGETHERAI_API_KEY else None,
-#     model=app_env.TOGETHER_LLM_MODEL
-# )
-
-
-# GROQ AI
-from langchain_groq import ChatGroq
-llm_provider = ChatGroq(
-    model=app_env.GROQ_LLM_MODEL if app_env.GROQ_LLM_MODEL else "llama3-70b-8192",  # Default if not set
-    temperature=0,
-    streaming=True,
-    api_key=app_env.GROQ_API_KEY.get_secret_value() if app_env.GROQ_API_KEY else None
-)
+def __getattr__(name):
+    if name == "search_llm_provider":
+        return get_search_llm()
+    if name == "llm_provider":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,7 +5,7 @@ from langchain_core.documents import Document
 from langchain_community.vectorstores import SupabaseVectorStore
 from supabase.client import Client, create_client
 
-from app.adapters.embedder_adapter import embedder
+from app.adapters.embedder_adapter import get_embedder
 from app.interfaces.vector_store_interface import VectorStoreInterface
 
 
@@ -13,12 +13,12 @@ class SupabaseVectorStoreAdapter(VectorStoreInterface):
     def __init__(self, url: str, key: str, collection_name: str, query_function_name: str):
         self.supabase_client: Client = create_client(url, key)
         self.vector_store = SupabaseVectorStore(
-            embedding=embedder,
+            embedding=get_embedder(),
             client=self.supabase_client,
             table_name=collection_name,
             query_name=query_function_name,
         )
-        self.embedder = embedder
+        self.embedder = get_embedder()
 
     def add_document(self, source_content: str, user_id: str) -> List[str]:
         """
@@ -1,4 +1,6 @@
-system_prompt = """
+import textwrap
+
+_SYSTEM_PROMPT_SOURCE = """
     **Role Description:**  
     You are a Memory AI Agent designed to assist users by managing and leveraging a memory system to provide personalized and contextual responses.
     You maintain, organize, and retrieve memories stored in a hybrid data storage system. Your goal is to enhance interactions by recalling user-specific
@@ -84,4 +86,8 @@ system_prompt = """
 
     Do not come up with the answer, use context from `search_for_memories` to get relevant context and your answer must be based on that context only.
     If there is no relevant context found, say "I don't know, would you like me to add it?"
-"""
\ No newline at end of file
+"""
+
+# The source above is indented for readability; the model doesn't need the leading indentation or
+# trailing spaces, and every one of them is a billed prompt token on each turn.
+system_prompt = "\n".join(line.rstrip() for line in textwrap.dedent(_SYSTEM_PROMPT_SOURCE).strip().splitlines())
@@ -1,139 +1,172 @@
+from functools import lru_cache
 from typing import List, Tuple
 
-from langchain.agents import AgentExecutor
-from langchain.agents.format_scratchpad import format_to_openai_function_messages
-from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from pydantic import BaseModel, Field
-from langchain.schema import AIMessage, HumanMessage
-from langchain_core.utils.function_calling import convert_to_openai_function
+from pydantic import BaseModel, ConfigDict, Field
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
 
 from app.app_env import app_env
-from app.adapters.llm_adapter import search_llm_provider
-from app.agent_prompts.custom_prompt import system_prompt
+from app.adapters.llm_adapter import get_search_llm
+from app.agent_prompts.default_prompt import system_prompt
 from app.utils.get_current_date import get_current_datetime_cranford
 
-from app.tools.search.search_tool import SearchForMemoryItemsTool
-from app.tools.add.add_tool import AddGraphMemoryTool
-from app.tools.get_all.get_all_tool import GetAllMemoryItemsTool
-from app.tools.update.update_tool import UpdateGraphMemoryTool
-from app.tools.delete.delete_tool import DeleteGraphMemoryTool
-from app.tools.documents_search.documents_search_tool import SearchForDocumentSnippetsTool, SearchForDocumentsTool
-
-tools = [
-    SearchForMemoryItemsTool(),
-    AddGraphMemoryTool(),
-    GetAllMemoryItemsTool(),
-    UpdateGraphMemoryTool(),
-    DeleteGraphMemoryTool(),
-    SearchForDocumentSnippetsTool(),
-    SearchForDocumentsTool()
-]
-
-llm_with_tools = search_llm_provider.bind(functions=[convert_to_openai_function(t) for t in tools])
-
-prompt = ChatPromptTemplate.from_messages(
-    [
-        (
-            "system",
-            f"""
-            {system_prompt}
-            ---
-            Current date and time in Cranford, NJ: {get_current_datetime_cranford()}
-            ---
-            Refer to user by user name:  {app_env.APP_USERNAME}
-            """
-        ),
-        MessagesPlaceholder(variable_name="chat_history"),
-        ("user", "{input}"),
-        MessagesPlaceholder(variable_name="agent_scratchpad"),
-    ]
-)
-
 
 def _format_chat_history(chat_history: List[Tuple[str, str]]):
-    buffer = []
-    for human, ai in chat_history:
-        buffer.append(HumanMessage(content=human))
-        buffer.append(AIMessage(content=ai))
-    return buffer
-
-
-agent = (
-    {
-        "input": lambda x: x["input"],
-        "chat_history": lambda x: x["chat_history"]
-        if x.get("chat_history")
-        else [],
-        "agent_scratchpad": lambda x: format_to_openai_function_messages(
-            x["intermediate_steps"]
-        ),
-    }
-    | prompt
-    | llm_with_tools
-    | OpenAIFunctionsAgentOutputParser()
-)
+    return [
+        message
+        for human, ai in chat_history
+        for message in (HumanMessage(content=human), AIMessage(content=ai))
+    ]
 
 
 # Add typing for input
 class AgentInput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     input: str
     chat_history: List[Tuple[str, str]] = Field(
         ..., extra={"widget": {"type": "chat", "input": "input", "output": "output"}}
     )
 
 
-agent_executor = AgentExecutor(
-    agent=agent,
-    verbose=True,
-    tools=tools).with_types(
-    input_type=AgentInput,
-)
+@lru_cache(maxsize=1)
+def get_agent_executor():
+    """
+    Builds the OpenAI-functions agent on first use. The agent runtime, prompt templates and tool
+    modules are imported here rather than at module level, so importing this module (e.g. for the
+    history helpers) stays cheap.
+    """
+    from langchain.agents import AgentExecutor
+    from langchain.agents.format_scratchpad import format_to_openai_function_messages
+    from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from langchain_core.utils.function_calling import convert_to_openai_function
+
+    from app.tools.search.search_tool import SearchForMemoryItemsTool
+    from app.tools.add.add_tool import AddGraphMemoryTool
+    from app.tools.get_all.get_all_tool import GetAllMemoryItemsTool
+    from app.tools.update.update_tool import UpdateGraphMemoryTool
+    from app.tools.delete.delete_tool import DeleteGraphMemoryTool
+    from app.tools.documents_search.documents_search_tool import SearchForDocumentSnippetsTool, SearchForDocumentsTool
+
+    tools = [
+        SearchForMemoryItemsTool(),
+        AddGraphMemoryTool(),
+        GetAllMemoryItemsTool(),
+        UpdateGraphMemoryTool(),
+        DeleteGraphMemoryTool(),
+        SearchForDocumentSnippetsTool(),
+        SearchForDocumentsTool()
+    ]
+
+    llm_with_tools = get_search_llm().bind(functions=[convert_to_openai_function(t) for t in tools])
+
+    # The static block is a SystemMessage (sent verbatim, not templated) so it stays byte-identical
+    # across calls and is eligible for the provider's prefix cache. The clock sits right before the
+    # new user input so the chat history also remains part of the cacheable prefix.
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            SystemMessage(content=f"{system_prompt}\n---\nRefer to user by user name: {app_env.APP_USERNAME}"),
+            MessagesPlaceholder(variable_name="chat_history"),
+            ("user", "[context] Current date and time in Cranford, NJ: {current_datetime}"),
+            ("user", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ]
+    )
+
+    agent = (
+        {
+            "input": lambda x: x["input"],
+            "current_datetime": lambda x: get_current_datetime_cranford(),
+            "chat_history": lambda x: x["chat_history"]
+            if x.get("chat_history")
+            else [],
+            "agent_scratchpad": lambda x: format_to_openai_function_messages(
+                x["intermediate_steps"]
+            ),
+        }
+        | prompt
+        | llm_with_tools
+        | OpenAIFunctionsAgentOutputParser()
+    )
+
+    return AgentExecutor(
+        agent=agent,
+        verbose=True,
+        # Callers check which tools ran (e.g. to invalidate the response cache after a write).
+        return_intermediate_steps=True,
+        tools=tools).with_types(
+        input_type=AgentInput,
+    )
+
+
+def __getattr__(name):
+    if name == "agent_executor":
+        return get_agent_executor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # --- New helper functions for summarization-based pruning ---
+_ROLE_PREFIX = {HumanMessage: "User", AIMessage: "Assistant"}
+
+
+def _role_prefix(msg) -> str:
+    """Map a message to its transcript prefix with a type lookup, walking the MRO for subclasses."""
+    prefix = _ROLE_PREFIX.get(type(msg))
+    if prefix is None:
+        prefix = next((_ROLE_PREFIX[cls] for cls in type(msg).__mro__ if cls in _ROLE_PREFIX), "")
+        _ROLE_PREFIX[type(msg)] = prefix
+    return prefix
+
+
 def summarize_conversation(messages: List[Tuple[str, str]]) -> str:
     """
     Summarize a list of conversation turns into a concise summary.
     """
     # Combine the conversation into a text block.
-    conversation_turns = []
-    for msg in messages:
-        if isinstance(msg, HumanMessage):
-            conversation_turns.append(f"User: {msg.content}")
-        elif isinstance(msg, AIMessage):
-            conversation_turns.append(f"Assistant: {msg.content}")
-    conversation = "\n".join(conversation_turns)
+    conversation = "\n".join(
+        f"{prefix}: {msg.content}" for msg in messages if (prefix := _role_prefix(msg))
+    )
     summarization_prompt = (
         f"Please provide a concise summary of the following conversation:\n\n{conversation}\n\nSummary:"
     )
-    summary_response = search_llm_provider.invoke(summarization_prompt)
-    if isinstance(summary_response, AIMessage):
-        return summary_response.content
-    elif isinstance(summary_response, dict) and "content" in summary_response:
-        return summary_response["content"]
-    else:
-        return "Summary not available."
+    summary_response = get_search_llm().invoke(summarization_prompt)
+    # Chat models return a message; anything else exposing .content (or a plain dict) works too.
+    content = getattr(summary_response, "content", None)
+    if content is None and isinstance(summary_response, dict):
+        content = summary_response.get("content")
+    return content if content is not None else "Summary not available."
+
+
+# Token budget for the history sent with each turn. Counted with a ~4 chars/token estimate: cheap,
+# and close enough for English text to keep the request well inside the context window.
+HISTORY_TOKEN_BUDGET = 4000
 
 
-def prune_chat_history(chat_history: List[Tuple[str, str]], threshold: int = 8) -> List[Tuple[str, str]]:
+def _approx_tokens(msg) -> int:
+    # History entries are (role, text) tuples, as AgentInput declares, or LangChain messages.
+    text = msg[1] if isinstance(msg, tuple) else msg.content
+    return len(str(text)) // 4 + 1
+
+
+def prune_chat_history(chat_history: List, token_budget: int = HISTORY_TOKEN_BUDGET) -> List:
     """
-    If the chat history exceeds the threshold, summarize the older messages and
-    retain only the most recent interactions in full.
+    Keep the most recent messages that fit in the token budget (always at least the latest one)
+    and drop the older ones. No summarization call is made, so pruning never delays a turn.
     """
-    if len(chat_history) <= threshold:
+    used = 0
+    keep = 0
+    for msg in reversed(chat_history):
+        used += _approx_tokens(msg)
+        if used > token_budget and keep:
+            break
+        keep += 1
+    if keep == len(chat_history):
         return chat_history
-
-    # Summarize all messages except for the last two interactions.
-    to_summarize = chat_history[:-2]
-    summarized_text = summarize_conversation(to_summarize)
-    # Replace the old messages with a single summary entry.
-    pruned_history = [AIMessage(content=summarized_text)] + chat_history[-2:]
-    return pruned_history
+    return chat_history[len(chat_history) - keep:]
 
 
 async def invoke_memory_agent(latest_prompt: str, chat_history=None):
     if chat_history is None:
         chat_history = []
     pruned_history = prune_chat_history(chat_history)
-    return await agent_executor.ainvoke({"input": latest_prompt, "chat_history": pruned_history})
+    return await get_agent_executor().ainvoke({"input": latest_prompt, "chat_history": pruned_history})
@@ -1,10 +1,16 @@
+import time
+from functools import lru_cache
+from typing import Callable, Optional
+
 from langgraph.prebuilt import create_react_agent
-from langchain.schema import SystemMessage
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessageChunk
 
 from app.app_env import app_env
-from app.adapters.llm_adapter import search_llm_provider
+from app.adapters.llm_adapter import get_search_llm
 from app.agent_prompts.default_prompt import system_prompt
 from app.utils.get_current_date import get_current_datetime_cranford
+from app.services.semantic_cache import MUTATING_TOOLS, cached_answer, dated_scope, get_semantic_cache, remember_answer
 
 from app.tools.search.search_tool import search_for_memories
 from app.tools.add.add_tool import add_graph_memory
@@ -23,18 +29,120 @@ tools = [
     search_for_documents,
 ]
 
-agent_system_prompt = f"""
-    {system_prompt}
-    ---
-    Current date and time in Cranford, NJ: {get_current_datetime_cranford()}
-    ---
-    Refer to user by this name:  {app_env.APP_USERNAME}
-"""
+# OpenAI caches repeated prompt prefixes automatically. The system prompt (prompt body and
+# user name) is byte-stable and leads every request; the clock goes in a small context message
+# just before the latest user turn, so the system prompt *and* the prior conversation stay
+# cacheable and only the tail of the request changes from minute to minute.
+_STATIC_SYSTEM_MESSAGE = SystemMessage(content=f"{system_prompt}\n---\nRefer to user by this name: {app_env.APP_USERNAME}")
+
+_CONTEXT_TTL_SECONDS = 30
+
+
+@lru_cache(maxsize=2)
+def _context_message(time_bucket: int) -> HumanMessage:
+    # time_bucket is only the cache key: the message is rebuilt at most once per window.
+    return HumanMessage(content=f"[context] Current date and time in Cranford, NJ: {get_current_datetime_cranford()}")
+
+
+def _state_modifier(state):
+    messages = state["messages"]
+    context = _context_message(int(time.time()) // _CONTEXT_TTL_SECONDS)
+    # Insert ahead of the latest user message; any tool-call round trips that follow it stay in order.
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return [_STATIC_SYSTEM_MESSAGE, *messages[:i], context, *messages[i:]]
+    return [_STATIC_SYSTEM_MESSAGE, context, *messages]
+
+
+@lru_cache(maxsize=1)
+def get_graph():
+    """
+    Compiles the ReAct graph on first use and reuses it afterwards, so importing this module
+    doesn't bind tool schemas to the model or build the provider client.
+    """
+    return create_react_agent(get_search_llm(), tools=tools, state_modifier=_state_modifier)
+
+
+def __getattr__(name):
+    if name == "graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-graph = create_react_agent(search_llm_provider, tools=tools, state_modifier=SystemMessage(content=agent_system_prompt))
 
+def _cache_scope(st_messages) -> str:
+    # The assistant reply the latest user message answers, so follow-ups are matched in context.
+    for message in reversed(st_messages[:-1]):
+        if isinstance(message, AIMessage):
+            return dated_scope(str(message.content))
+    return dated_scope()
 
-def invoke_our_graph(st_messages, callables):
+
+def _called_mutating_tool(new_messages) -> bool:
+    return any(
+        call["name"] in MUTATING_TOOLS
+        for message in new_messages
+        for call in (getattr(message, "tool_calls", None) or ())
+    )
+
+
+def _cached_answer(st_messages):
+    """
+    Looks the latest user message up in the response cache. Returns (cache, vector, scope, answer);
+    cache is None when caching doesn't apply, answer is None on a miss or a failed lookup.
+    """
+    cache = get_semantic_cache()
+    if cache is None or not st_messages or not isinstance(st_messages[-1], HumanMessage):
+        return None, None, None, None
+    scope = _cache_scope(st_messages)
+    query_vector, answer = cached_answer(cache, str(st_messages[-1].content), scope)
+    return cache, query_vector, scope, answer
+
+
+def _remember_answer(cache, query_vector, scope, st_messages, final_messages) -> None:
+    remember_answer(
+        cache, query_vector, scope, str(final_messages[-1].content),
+        memories_changed=_called_mutating_tool(final_messages[len(st_messages):]),
+    )
+
+
+def stream_our_graph(st_messages, callables, on_answer: Optional[Callable[[str], None]] = None):
+    """
+    Yields the assistant's reply text token by token as the model produces it (for st.write_stream).
+    Text a model sends alongside a tool call is shown too, set apart from the rounds after it, so
+    the streamed text can hold more than the reply itself; `on_answer` receives just the final
+    reply (the text the cache replays), which is what belongs in the chat history.
+    """
     if not isinstance(callables, list):
         raise TypeError("callables must be a list")
-    return graph.invoke({"messages": st_messages}, config={"callbacks": callables})
+
+    cache, query_vector, scope, cached = _cached_answer(st_messages)
+    if cached is not None:
+        yield cached
+        if on_answer is not None:
+            on_answer(cached)
+        return
+
+    final_state = None
+    streamed_message_id = None
+    for mode, payload in get_graph().stream(
+        {"messages": st_messages},
+        config={"callbacks": callables},
+        stream_mode=["messages", "values"],
+    ):
+        if mode == "values":
+            final_state = payload
+            continue
+        chunk, metadata = payload
+        if metadata.get("langgraph_node") == "agent" and isinstance(chunk, AIMessageChunk) \
+                and isinstance(chunk.content, str) and chunk.content:
+            if streamed_message_id is not None and chunk.id != streamed_message_id:
+                yield "\n\n"  # a new model round: don't run it into the previous one
+            streamed_message_id = chunk.id
+            yield chunk.content
+
+    if final_state is None:
+        return
+    if on_answer is not None:
+        on_answer(str(final_state["messages"][-1].content))
+    if cache is not None:
+        _remember_answer(cache, query_vector, scope, st_messages, final_state["messages"])
@@ -1,4 +1,5 @@
 from typing import Optional, Dict, Any, List
+import functools
 import logging
 
 from app.interfaces.graph_db_interface import GraphDBInterface
@@ -23,7 +24,7 @@ class NullGraphDB(GraphDBInterface):
     to proceed without errors.
     """
     def query(self, cypher_query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        logger.info(f"GraphDB is not configured or is disabled. Query not executed: {cypher_query[:100]}...")
+        logger.info("GraphDB is not configured or is disabled. Query not executed: %.100s...", cypher_query)
         return []
 
 
@@ -36,7 +37,7 @@ class NullVertexAISearch(VertexAISearchInterface):
     to proceed without errors.
     """
     def retrieve(self, query: str) -> List[Document]:
-        logger.info(f"Vertex AI Search is not configured or is disabled. Query not executed: {query[:100]}...")
+        logger.info("Vertex AI Search is not configured or is disabled. Query not executed: %.100s...", query)
         return []
 
 
@@ -47,90 +48,82 @@ class NullVectorStore(VectorStoreInterface):
     Used when the vector store is disabled or not configured.
     """
     def add_document(self, source_content: str, user_id: str) -> List[str]:
-        logger.info(f"VectorStore is not configured. {source_content} not added.")
+        logger.info("VectorStore is not configured. %s not added.", source_content)
         return [source_content]
 
     def similarity_search(self, query: str, k: int = 10, filter: Optional[Dict[str, Any]] = None) -> List[Document]:
-        logger.info(f"VectorStore is not configured. Similarity search for '{query[:50]}...' not performed.")
+        logger.info("VectorStore is not configured. Similarity search for '%.50s...' not performed.", query)
         return []
 
     def delete_document(self, ids: List[str]) -> bool:
-        logger.info(f"VectorStore is not configured. {len(ids)} documents not deleted.")
+        logger.info("VectorStore is not configured. %d documents not deleted.", len(ids))
         return False
 
     def hybrid_search(self, query: str, filter_params: Optional[Dict[str, Any]] = None) -> List[Document]:
-        logger.info(f"VectorStore is not configured. Hybrid search for '{query[:50]}...' not performed.")
+        logger.info("VectorStore is not configured. Hybrid search for '%.50s...' not performed.", query)
         return []
 
 
 # --- Singleton instances ---
-_graph_db_instance: Optional[GraphDBInterface] = None
-_vector_store_instance: Optional[VectorStoreInterface] = None
-_vertex_ai_search_instance: Optional[VertexAISearchInterface] = None
+# functools.cache makes each getter build its instance once; later calls are a cache hit.
 
 
+@functools.cache
 def get_graph_db_instance() -> GraphDBInterface:
     """
     Provides a singleton instance of the configured GraphDBInterface.
     Initializes the instance on first call based on settings.
     """
-    global _graph_db_instance
-    if _graph_db_instance is None:
-        logger.info(f"Initializing GraphDB instance with provider: {GRAPH_DB_PROVIDER}")
-        if GRAPH_DB_PROVIDER == "neo4j":
-            _graph_db_instance = Neo4jAdapter(
-                url=app_env.NEO4J_URL,
-                username=app_env.NEO4J_USER,
-                password=app_env.NEO4J_PWD.get_secret_value()
-            )
-        # Add other providers here with an elif block
-        # elif GRAPH_DB_PROVIDER == "another_graph_provider":
-        #     _graph_db_instance = AnotherGraphAdapter(...)
-        else:  # "none" or unrecognized
-            _graph_db_instance = NullGraphDB()
-    return _graph_db_instance
+    logger.info(f"Initializing GraphDB instance with provider: {GRAPH_DB_PROVIDER}")
+    if GRAPH_DB_PROVIDER == "neo4j":
+        return Neo4jAdapter(
+            url=app_env.NEO4J_URL,
+            username=app_env.NEO4J_USER,
+            password=app_env.NEO4J_PWD.get_secret_value()
+        )
+    # Add other providers here with an elif block
+    # elif GRAPH_DB_PROVIDER == "another_graph_provider":
+    #     return AnotherGraphAdapter(...)
+    # "none" or unrecognized
+    return NullGraphDB()
 
 
+@functools.cache
 def get_vertex_ai_search_instance() -> VertexAISearchInterface:
     """
-    Provides a singleton instance of the configured GraphDBInterface.
+    Provides a singleton instance of the configured VertexAISearchInterface.
     Initializes the instance on first call based on settings.
     """
-    global _vertex_ai_search_instance
-    if _vertex_ai_search_instance is None:
-        logger.info("Initializing Vertex AI Search instance")
-        _vertex_ai_search_instance = VertexAISearchAdapter(
-            project_id=app_env.VERTEX_AI_PROJECT_ID,
-            location_id=app_env.VERTEX_AI_LOCATION_ID,
-            datastore_id=app_env.VERTEX_AI_DATASTORE_ID,
-        )
-    else:  # "none" or unrecognized
-        _vertex_ai_search_instance = NullVertexAISearch()
-    return _vertex_ai_search_instance
-
-
+    logger.info("Initializing Vertex AI Search instance")
+    if not (app_env.VERTEX_AI_PROJECT_ID and app_env.VERTEX_AI_LOCATION_ID and app_env.VERTEX_AI_DATASTORE_ID):
+        logger.info("Vertex AI Search is not configured. Falling back to NullVertexAISearch.")
+        return NullVertexAISearch()
+    return VertexAISearchAdapter(
+        project_id=app_env.VERTEX_AI_PROJECT_ID,
+        location_id=app_env.VERTEX_AI_LOCATION_ID,
+        datastore_id=app_env.VERTEX_AI_DATASTORE_ID,
+    )
+
+
+@functools.cache
 def get_vector_store_instance() -> VectorStoreInterface:
     """
     Provides a singleton instance of the configured VectorStoreInterface.
     Initializes the instance on first call based on settings.
     """
-    global _vector_store_instance
-    if _vector_store_instance is None:
-        logger.info(f"Initializing VectorStore instance with provider: {VECTOR_STORE_PROVIDER}")
-        if VECTOR_STORE_PROVIDER == "supabase":
-            if not app_env.SUPABASE_URL or not app_env.SUPABASE_KEY:
-                logger.error("Supabase URL or Key is not configured. Falling back to NullVectorStore.")
-                _vector_store_instance = NullVectorStore()
-            else:
-                _vector_store_instance = SupabaseVectorStoreAdapter(
-                    url=app_env.SUPABASE_URL,
-                    key=app_env.SUPABASE_KEY.get_secret_value(),
-                    collection_name=app_env.SUPABASE_VECTOR_COLLECTION_NAME,
-                    query_function_name=app_env.SUPABASE_VECTOR_QUERY_FUNCTION_NAME
-                )
-        # Add other providers here with an elif block
-        # elif VECTOR_STORE_PROVIDER == "pinecone":
-        #     _vector_store_instance = PineconeVectorStoreAdapter(...)
-        else:  # "none" or unrecognized
-            _vector_store_instance = NullVectorStore()
-    return _vector_store_instance
+    logger.info(f"Initializing VectorStore instance with provider: {VECTOR_STORE_PROVIDER}")
+    if VECTOR_STORE_PROVIDER == "supabase":
+        if not app_env.SUPABASE_URL or not app_env.SUPABASE_KEY:
+            logger.error("Supabase URL or Key is not configured. Falling back to NullVectorStore.")
+            return NullVectorStore()
+        return SupabaseVectorStoreAdapter(
+            url=app_env.SUPABASE_URL,
+            key=app_env.SUPABASE_KEY.get_secret_value(),
+            collection_name=app_env.SUPABASE_VECTOR_COLLECTION_NAME,
+            query_function_name=app_env.SUPABASE_VECTOR_QUERY_FUNCTION_NAME
+        )
+    # Add other providers here with an elif block
+    # elif VECTOR_STORE_PROVIDER == "pinecone":
+    #     return PineconeVectorStoreAdapter(...)
+    # "none" or unrecognized
+    return NullVectorStore()
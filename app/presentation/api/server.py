@@ -1,8 +1,58 @@
+import asyncio
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Tuple
+
 from fastapi import FastAPI, HTTPException
-from app.agents.agent_executor import agent_executor as neo4j_semantic_agent
-from pydantic import BaseModel
+from app.agents.agent_executor import get_agent_executor
+from app.services.semantic_cache import MUTATING_TOOLS, cached_answer, dated_scope, get_semantic_cache, remember_answer
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _start_log_listener() -> Tuple[QueueListener, List[logging.Handler]]:
+    """
+    Routes root log records through a queue so the (blocking) stream/file handlers run on the
+    listener's thread instead of the event loop. Returns the listener and the original handlers.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *(handlers or [logging.StreamHandler()]), respect_handler_level=True)
+    listener.start()
+    return listener, handlers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener, handlers = _start_log_listener()
+    # Build the agent (LLM client, tool schemas) and the response cache before serving,
+    # so the first request doesn't pay for it.
+    await asyncio.to_thread(get_agent_executor)
+    await asyncio.to_thread(get_semantic_cache)  # may reload a persisted cache from disk
+    try:
+        yield
+    finally:
+        listener.stop()  # flushes queued records
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            if isinstance(handler, QueueHandler):
+                root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+QUERY_TYPES = ("naive", "local", "global", "hybrid", "mix")
+MAX_BATCH_SEARCH_ITEMS = 100
 
 
 # Model for request data
@@ -11,18 +61,43 @@ class SearchRequest(BaseModel):
     query_type: str
 
 
+class BatchSearchRequest(BaseModel):
+    items: List[SearchRequest] = Field(..., max_length=MAX_BATCH_SEARCH_ITEMS)
+
+
 class AddTextRequest(BaseModel):
     text: list
 
 
+async def _answer(search_text: str) -> str:
+    """Runs the agent for one search, answering repeated questions from the semantic cache."""
+    cache = get_semantic_cache()
+    if cache is None:
+        return (await get_agent_executor().ainvoke({"input": search_text}))["output"]
+
+    scope = dated_scope()
+    vector, cached = await asyncio.to_thread(cached_answer, cache, search_text, scope)
+    if cached is not None:
+        return cached
+
+    result = await get_agent_executor().ainvoke({"input": search_text})
+    remember_answer(
+        cache, vector, scope, result["output"],
+        memories_changed=any(action.tool in MUTATING_TOOLS for action, _ in result.get("intermediate_steps", ())),
+    )
+    return result["output"]
+
+
 @app.post("/add_text")
-def add_text(data: AddTextRequest):
+async def add_text(data: AddTextRequest):
     try:
-        print(f"Input add text data: {data}")
+        logger.info("Add text: %d items", len(data.text))
         text = data.text
 
         # Assuming `insert` method of LightRAG
-        neo4j_semantic_agent.invoke({"input": text})
+        await get_agent_executor().ainvoke({"input": text})
+        if (cache := get_semantic_cache()) is not None:
+            cache.invalidate()
 
         return {"message": "Text added successfully!"}
     except Exception as e:
@@ -30,22 +105,48 @@ def add_text(data: AddTextRequest):
 
 
 @app.post("/search")
-def search(data: SearchRequest):
+async def search(data: SearchRequest):
     try:
         search_text = data.search_text
         query_type = data.query_type
 
-        print(f"Search query: {search_text}")
+        logger.info("Search query (%s): %.200s", query_type, search_text)
 
-        if query_type not in ["naive", "local", "global", "hybrid", "mix"]:
+        if query_type not in QUERY_TYPES:
             raise HTTPException(status_code=400, detail="Invalid query type.")
-        
-        result = neo4j_semantic_agent.invoke({"input": search_text})
 
-        output = result["output"]
+        output = await _answer(search_text)
 
-        print(f"Search output: {output}")
+        logger.info("Search output: %.200s", output)
 
         return {"result": output}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/batch_search")
+async def batch_search(data: BatchSearchRequest):
+    """
+    Runs several searches concurrently. Identical search texts are answered once, and repeated
+    questions may come straight from the semantic cache. Results are returned in request order,
+    with per-item errors instead of failing the whole batch.
+    """
+    if any(item.query_type not in QUERY_TYPES for item in data.items):
+        raise HTTPException(status_code=400, detail="Invalid query type.")
+
+    logger.info("Batch search: %d queries", len(data.items))
+
+    unique_texts = list(dict.fromkeys(item.search_text for item in data.items))
+    outcomes = await asyncio.gather(*(_answer(text) for text in unique_texts), return_exceptions=True)
+    outcome_by_text = dict(zip(unique_texts, outcomes))
+
+    results = []
+    for item in data.items:
+        outcome = outcome_by_text[item.search_text]
+        if isinstance(outcome, BaseException):
+            results.append({"result": None, "error": str(outcome)})
+        else:
+            results.append({"result": outcome})
+    return {"results": results}
@@ -3,19 +3,35 @@ Memory AI Agent - Streamlit Chat Application
 A Streamlit-based chat interface for interacting with an AI agent with memory capabilities.
 """
 
-import os
 from dotenv import load_dotenv
 import streamlit as st
 from langchain_core.messages import AIMessage, HumanMessage
 from app.services.document_processing_service import parseAndIngestPDFs
 from app.app_env import app_env
 from app.services.auth_service import authenticate, display_user_info
-from app.agents.react_graph_agent import invoke_our_graph
+from app.agents.react_graph_agent import stream_our_graph
+from app.services.semantic_cache import get_semantic_cache
 from app.presentation.web.streamlit.streamlit_langraph_callback import get_streamlit_cb
 
 # Load environment variables
 load_dotenv()
 
+_HIDE_DEPLOY_BUTTON_STYLE = """
+<style>
+    /* Hide the "Deploy" button */
+    .stAppDeployButton {
+        display: none !important;
+    }
+    /* Optional: If you want to remove the entire header menu */
+    #MainMenu {
+        visibility: hidden;
+    }
+    footer {
+        visibility: hidden;
+    }
+</style>
+"""
+
 
 def render_chat_ui():
     """
@@ -62,23 +78,7 @@ def render_chat_ui():
 
 def hide_deploy_button():
     """Hide the Streamlit deploy button."""
-    # Hide the "Deploy" button
-    hide_deploy_button_style = """
-        <style>
-            /* Hide the "Deploy" button */
-            .stAppDeployButton {
-                display: none !important;
-            }
-            /* Optional: If you want to remove the entire header menu */
-            #MainMenu {
-                visibility: hidden;
-            }
-            footer {
-                visibility: hidden;
-            }
-        </style>
-    """
-    st.markdown(hide_deploy_button_style, unsafe_allow_html=True)
+    st.markdown(_HIDE_DEPLOY_BUTTON_STYLE, unsafe_allow_html=True)
 
 
 def handle_file_upload():
@@ -93,21 +93,16 @@ def handle_file_upload():
     if uploaded_file is not None:
         st.session_state.is_processing_pdf = True
         
-        # Create temporary directory for file processing
-        temp_dir = "../../../temp"
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_file_path = os.path.join(temp_dir, uploaded_file.name)
-        
-        # Save uploaded file temporarily
-        with open(temp_file_path, "wb") as file:
-            file.write(uploaded_file.getbuffer())
-        
         # Process the PDF
         processing_status = st.empty()
         processing_status.info("Processing uploaded file...")
         
         try:
-            file_info = parseAndIngestPDFs(temp_file_path, uploaded_file.name, app_env.GCS_BUCKET_NAME)
+            # The upload is already in memory: hand it to GCS directly instead of via a temp file
+            file_info = parseAndIngestPDFs(uploaded_file, uploaded_file.name, app_env.GCS_BUCKET_NAME)
+            # New document content can change answers already in the response cache.
+            if (cache := get_semantic_cache()) is not None:
+                cache.invalidate()
             processing_status.empty()
             st.success("File uploaded and processed successfully!")
             st.write("File Information:", file_info)
@@ -115,10 +110,6 @@ def handle_file_upload():
             processing_status.empty()
             st.error(f"Error processing file: {error}")
         finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-            
             # Reset processing state
             st.session_state.is_processing_pdf = False
             st.session_state.uploaded_file = None
@@ -152,15 +143,12 @@ def process_user_input():
         # Generate and display AI response
         with st.chat_message("assistant"):
             chat_history = st.session_state.messages
-            response_placeholder = st.empty()
             
-            # Set up streaming callback
+            # Set up streaming callback (renders tool steps above the answer)
             streaming_callback = get_streamlit_cb(st.container())
             
-            # Get response from agent
-            response = invoke_our_graph(chat_history, [streaming_callback])
-            
-            # Extract and display the AI's response
-            ai_response = response["messages"][-1].content
-            st.session_state.messages.append(AIMessage(content=ai_response))
-            response_placeholder.write(ai_response)
+            # Stream the agent's answer into the chat as it is generated; the history keeps only
+            # the final reply, not any text the model wrote between tool calls
+            answers = []
+            st.write_stream(stream_our_graph(chat_history, [streaming_callback], on_answer=answers.append))
+            st.session_state.messages.append(AIMessage(content=answers[-1] if answers else ""))
@@ -7,6 +7,13 @@ from streamlit.delta_generator import DeltaGenerator
 from langchain_core.callbacks.base import BaseCallbackHandler
 from langchain_community.callbacks.streamlit import StreamlitCallbackHandler
 
+# Callback methods that respond to LLM events, read off the class once instead of introspecting
+# every handler instance.
+_CALLBACK_METHOD_NAMES = tuple(
+    name for name, _ in inspect.getmembers(StreamlitCallbackHandler, predicate=inspect.isfunction)
+    if name.startswith('on_')
+)
+
 
 # Define a function to wrap and add context to Streamlit's integration with LangGraph
 def get_streamlit_cb(parent_container: DeltaGenerator) -> BaseCallbackHandler:
@@ -60,7 +67,9 @@ def get_streamlit_cb(parent_container: DeltaGenerator) -> BaseCallbackHandler:
             # Add the previously captured Streamlit context to the current execution.
             # This step fixes NoSessionContext() errors by ensuring that Streamlit knows which session
             # is executing the code, allowing it to properly manage session state and updates.
-            add_script_run_ctx(ctx=ctx)
+            # Skipped when this thread already carries it (the script thread, or a previous callback).
+            if get_script_run_ctx(suppress_warning=True) is not ctx:
+                add_script_run_ctx(ctx=ctx)
             return fn(*args, **kwargs)  # Call the original function with its arguments
 
         return wrapper
@@ -68,12 +77,10 @@ def get_streamlit_cb(parent_container: DeltaGenerator) -> BaseCallbackHandler:
     # Create an instance of Streamlit's StreamlitCallbackHandler with the provided Streamlit container
     st_cb = StreamlitCallbackHandler(parent_container)
 
-    # Iterate over all methods of the StreamlitCallbackHandler instance
-    for method_name, method_func in inspect.getmembers(st_cb, predicate=inspect.ismethod):
-        if method_name.startswith('on_'):  # Identify callback methods that respond to LLM events
-            # Wrap each callback method with the Streamlit context setup to prevent session errors
-            setattr(st_cb, method_name,
-                    add_streamlit_context(method_func))  # Replace the method with the wrapped version
+    # Wrap each callback method with the Streamlit context setup to prevent session errors
+    for method_name in _CALLBACK_METHOD_NAMES:
+        setattr(st_cb, method_name,
+                add_streamlit_context(getattr(st_cb, method_name)))  # Replace the method with the wrapped version
 
     # Return the fully configured StreamlitCallbackHandler instance, now context-aware and integrated with any ChatLLM
     return st_cb
@@ -1,11 +1,13 @@
 import uuid
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import BinaryIO
 from neo4j import GraphDatabase
 from llmsherpa.readers import LayoutPDFReader
 
-from app.services.pdf_processing_service import upload_file_to_gcs
-from app.adapters.embedder_adapter import embedder
+from app.services.pdf_processing_service import upload_fileobj_to_gcs
+from app.adapters.embedder_adapter import get_embedder
 from app.app_env import app_env
 
 # Neo4j configuration
@@ -14,10 +16,40 @@ NEO4J_USER = app_env.NEO4J_USER
 NEO4J_PASSWORD = app_env.NEO4J_PWD
 NEO4J_DATABASE = "neo4j"
 
+# Shared driver; the neo4j driver is thread-safe and pools bolt connections internally.
+_driver = None
+
+
+def get_driver():
+    """Return the process-wide Neo4j driver, creating it on first use."""
+    global _driver
+    if _driver is None:
+        _driver = GraphDatabase.driver(
+            NEO4J_URL,
+            auth=(NEO4J_USER, NEO4J_PASSWORD.get_secret_value()),
+            max_connection_pool_size=app_env.NEO4J_MAX_CONNECTION_POOL_SIZE,
+        )
+    return _driver
+
 
 def get_embedding(text: str) -> list:
     """Generate an embedding for the given text using llmsherpa's OpenAIEmbeddings."""
-    return embedder.embed_query(text)
+    return get_embedder().embed_query(text)
+
+
+# Concurrent embedding requests issued while ingesting one document.
+EMBEDDING_WORKERS = 8
+
+
+def get_embeddings(texts: list) -> list:
+    """
+    Embeds many texts concurrently, returning embeddings in input order. Uses the same
+    embed_query call as get_embedding so stored vectors stay comparable with query vectors.
+    """
+    if not texts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(EMBEDDING_WORKERS, len(texts))) as pool:
+        return list(pool.map(get_embedding, texts))
 
 
 # File location for PDFs
@@ -34,14 +66,13 @@ def initialiseNeo4j():
         "CALL db.index.vector.dropNodeIndex('chunkVectorIndex') YIELD name RETURN name;",
         "CALL db.index.vector.createNodeIndex('chunkVectorIndex', 'Chunk', 'embedding', 1024, 'COSINE')"
     ]
-    driver = GraphDatabase.driver(NEO4J_URL, database=NEO4J_DATABASE, auth=(NEO4J_USER, NEO4J_PASSWORD))
-    with driver.session() as session:
+    driver = get_driver()
+    with driver.session(database=NEO4J_DATABASE) as session:
         for cypher in cypher_schema:
             try:
                 session.run(cypher)
             except Exception as e:
                 print(f"Error running cypher: {cypher}\nError: {e}")
-    driver.close()
 
 
 def ingestDocumentNeo4j(doc, file_name, doc_url):
@@ -65,8 +96,8 @@ def ingestDocumentNeo4j(doc, file_name, doc_url):
         "MATCH (t:Table {key: $doc_name_val+'|'+$block_idx_val+'|'+$name_val}) MATCH (s:Document {name: $doc_name_val}) MERGE (s)<-[:HAS_PARENT]-(t);"
     ]
 
-    driver = GraphDatabase.driver(NEO4J_URL, database=NEO4J_DATABASE, auth=(NEO4J_USER, NEO4J_PASSWORD))
-    with driver.session() as session:
+    driver = get_driver()
+    with driver.session(database=NEO4J_DATABASE) as session:
         doc_name_val = file_name
         doc_url_val = doc_url
 
@@ -105,6 +136,13 @@ def ingestDocumentNeo4j(doc, file_name, doc_url):
         else:
             parent_key_for_chunks = None  # We'll use normal parent linking if sections exist
 
+        # Embed every section title, chunk and table up front in parallel; each is a separate
+        # round trip to the embedding API, so issuing them one by one dominated ingestion time.
+        tables = list(doc.tables())
+        section_embeddings = iter(get_embeddings([sec.title for sec in sections if sec.tag != 'table']))
+        chunk_embeddings = iter(get_embeddings(["\n".join(chk.sentences) for chk in chunks if chk.tag != 'table']))
+        table_embeddings = iter(get_embeddings([tb.to_html() for tb in tables]))
+
         # Process Sections
         for sec in sections:
             sec_title_val = sec.title
@@ -114,10 +152,8 @@ def ingestDocumentNeo4j(doc, file_name, doc_url):
             sec_page_idx_val = sec.page_idx
             sec_block_idx_val = sec.block_idx
 
-            # Compute section embedding.
-            sec_embedding = get_embedding(sec_title_val)
-
             if sec_tag_val != 'table':
+                sec_embedding = next(section_embeddings)
                 cypher = cypher_pool[1]
                 session.run(cypher,
                             page_idx_val=sec_page_idx_val,
@@ -149,16 +185,15 @@ def ingestDocumentNeo4j(doc, file_name, doc_url):
                                 doc_name_val=doc_name_val)
 
         # Process Chunks
-        for chk in doc.chunks():
+        for chk in chunks:
             chunk_block_idx_val = chk.block_idx
             chunk_page_idx_val = chk.page_idx
             chunk_tag_val = chk.tag
             chunk_level_val = chk.level
             chunk_sentences = "\n".join(chk.sentences)
-            # Compute chunk embedding.
-            chunk_embedding = get_embedding(chunk_sentences)
 
             if chunk_tag_val != 'table':
+                chunk_embedding = next(chunk_embeddings)
                 chunk_sentences_hash_val = hashlib.md5(chunk_sentences.encode("utf-8")).hexdigest()
                 cypher = cypher_pool[4]
                 session.run(cypher,
@@ -195,14 +230,14 @@ def ingestDocumentNeo4j(doc, file_name, doc_url):
                                 default_section_key=parent_key_for_chunks)
 
         # Process Tables
-        for tb in doc.tables():
+        for tb in tables:
             page_idx_val = tb.page_idx
             block_idx_val = tb.block_idx
             name_val = 'block#' + str(block_idx_val) + '_' + tb.name
             html_val = tb.to_html()
             rows_val = len(tb.rows)
-            # Compute table embedding from the HTML content.
-            table_embedding = get_embedding(html_val)
+            # Table embedding was computed from the HTML content above.
+            table_embedding = next(table_embeddings)
             cypher = cypher_pool[6]
             session.run(cypher,
                         block_idx_val=block_idx_val,
@@ -235,14 +270,13 @@ def ingestDocumentNeo4j(doc, file_name, doc_url):
         print('#Sections: ' + str(len(doc.sections())))
         print('#Chunks: ' + str(len(doc.chunks())))
         print('#Tables: ' + str(len(doc.tables())))
-    driver.close()
 
 
-def parseAndIngestPDFs(pdf_file_path: str, file_name: str, bucket_name: str):
+def parseAndIngestPDFs(pdf_file: BinaryIO, file_name: str, bucket_name: str):
     file_id = str(uuid.uuid4())
-    # Upload file to Google Cloud Storage
+    # Upload file to Google Cloud Storage straight from the open file object
     destination_blob_name = f"uploads/{file_id}_{file_name}"
-    cloud_url = upload_file_to_gcs(pdf_file_path, bucket_name, destination_blob_name)
+    cloud_url = upload_fileobj_to_gcs(pdf_file, bucket_name, destination_blob_name)
     pdf_reader = LayoutPDFReader(app_env.LLM_SHERPA_API_URL)
     startTime = datetime.now()
 
@@ -265,8 +299,8 @@ def search_by_embedding(query: str, top_k: int = 50):
     that have an 'embedding' property, sorted by cosine similarity.
     """
     query_embedding = get_embedding(query)
-    driver = GraphDatabase.driver(NEO4J_URL, database=NEO4J_DATABASE, auth=(NEO4J_USER, NEO4J_PASSWORD))
-    with driver.session() as session:
+    driver = get_driver()
+    with driver.session(database=NEO4J_DATABASE) as session:
         cypher_query = """
             MATCH (c:Chunk)
             WHERE c.embedding IS NOT NULL
@@ -296,7 +330,6 @@ def search_by_embedding(query: str, top_k: int = 50):
                 "section": item["section"],
                 "sentences": item["chunk"],
             })
-    driver.close()
     return results
 
 
@@ -306,8 +339,8 @@ def search_for_all_documents(query: str):
         RETURN d.name AS source, d.url AS document_url, elementId(d) AS source_id
         ORDER BY d.name
     """
-    driver = GraphDatabase.driver(NEO4J_URL, database=NEO4J_DATABASE, auth=(NEO4J_USER, NEO4J_PASSWORD))
-    with driver.session() as session:
+    driver = get_driver()
+    with driver.session(database=NEO4J_DATABASE) as session:
         result = session.run(cypher_query)
         results = []
         for item in result:
@@ -316,7 +349,6 @@ def search_for_all_documents(query: str):
                 "document": item["source"],
                 "document_id": item["source_id"],
             })
-    driver.close()
     return results
 
 # Example search usage
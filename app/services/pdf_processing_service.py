@@ -1,5 +1,7 @@
 import uuid
 import os
+from functools import lru_cache
+from typing import BinaryIO
 import PyPDF2
 from google.cloud import storage
 from neo4j import GraphDatabase
@@ -8,7 +10,12 @@ from app.app_env import app_env
 SERVICE_ACCOUNT_FILE = os.path.join(os.path.dirname(__file__), "service_account.json")
 
 
+@lru_cache(maxsize=1)
 def get_storage_client():
+    """
+    Returns a process-wide storage client so credentials are loaded (and refreshed
+    tokens reused) once instead of on every upload.
+    """
     if os.getenv("K_SERVICE") or os.getenv("FUNCTION_TARGET"):
         return storage.Client()  # Cloud Function - use default creds
     return storage.Client.from_service_account_json(SERVICE_ACCOUNT_FILE)
@@ -41,6 +48,18 @@ def upload_file_to_gcs(file_path: str, bucket_name: str, destination_blob_name:
     return blob.public_url
 
 
+def upload_fileobj_to_gcs(file_obj: BinaryIO, bucket_name: str, destination_blob_name: str) -> str:
+    """
+    Uploads an open binary file (e.g. an in-memory upload) to Google Cloud Storage and returns its
+    public URL, without staging it on local disk first.
+    """
+    storage_client = get_storage_client()
+    bucket = storage_client.bucket(bucket_name)
+    blob = bucket.blob(destination_blob_name)
+    blob.upload_from_file(file_obj, rewind=True, content_type="application/pdf")
+    return blob.public_url
+
+
 def extract_pdf_metadata(pdf_file_path: str) -> dict:
     """
     Extracts basic metadata from a PDF file.
@@ -62,17 +81,19 @@ def extract_pdf_text(pdf_file_path: str) -> str:
     """
     Extracts the full text from a PDF file.
     """
-    full_text = ""
+    # Collect page texts and join once; += on a growing str copies the whole document per page.
+    pages = []
     try:
         with open(pdf_file_path, 'rb') as f:
             reader = PyPDF2.PdfReader(f)
             for page in reader.pages:
                 text = page.extract_text()
                 if text:
-                    full_text += text + "\n"
+                    pages.append(text)
+                    pages.append("\n")
     except Exception as e:
         print(f"Error extracting text: {e}")
-    return full_text
+    return "".join(pages)
 
 
 def chunk_text(text: str, chunk_size: int = 500) -> list:
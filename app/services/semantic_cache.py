@@ -0,0 +1,231 @@
+import base64
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.app_env import app_env
+from app.logger import app_logger as logger
+from app.adapters.embedder_adapter import get_embedder
+from app.utils.get_current_date import get_current_datetime_cranford
+
+# Tools that change what the agent would answer; a turn that calls any of them is never cached
+# and drops everything cached so far.
+MUTATING_TOOLS = frozenset({"add_graph_memory", "update_graph_memory", "delete_graph_memory"})
+
+
+class SemanticCache:
+    """
+    In-process cache of agent answers keyed by the embedding of the user's message.
+
+    A lookup hits when a previously answered message is at least `threshold` cosine-similar and
+    was asked in the same scope (callers pass the day and the assistant reply it followed), so
+    short follow-ups such as "yes" or "tell me more" are never answered out of context. Bounded to `max_entries`, evicting
+    the least recently used entry.
+
+    With `path` set, every stored answer is also appended to that file (one JSON object per line)
+    by a background writer thread, so callers never wait on disk, and the next process starts
+    from it instead of from an empty cache. The file is rewritten with just the live entries on
+    invalidation and after every `max_entries` appends, so it stays within about twice the
+    in-memory size. Entries older than `ttl_seconds` (0 = never) are neither served nor reloaded.
+    """
+
+    def __init__(self, threshold: float, max_entries: int, path: Optional[str] = None, ttl_seconds: int = 0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None  # (max_entries, dim), unit-normalised rows
+        self._entries = []  # slot -> (scope, response, stored_at)
+        self._lru = OrderedDict()  # slot -> None, least recently used first
+        self._pending_writes = queue.SimpleQueue()  # (rewrite?, records), written in order
+        self._appends_since_rewrite = 0
+        if path:
+            self._load()
+            threading.Thread(target=self._write_pending, name="semantic-cache-writer", daemon=True).start()
+
+    @staticmethod
+    def embed(text: str) -> np.ndarray:
+        vector = np.asarray(get_embedder().embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, vector: np.ndarray, scope: str = "") -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            if not self._entries or self._vectors.shape[1] != vector.shape[0]:
+                return None
+            similarities = self._vectors[:len(self._entries)] @ vector
+            for slot in np.argsort(similarities)[::-1]:
+                if similarities[slot] < self.threshold:
+                    break
+                entry_scope, response, stored_at = self._entries[slot]
+                if entry_scope == scope and not self._expired(stored_at, now):
+                    self._lru.move_to_end(int(slot))
+                    return response
+            return None
+
+    def store(self, vector: np.ndarray, response: str, scope: str = "") -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._insert(vector, scope, response, stored_at)
+            if not self.path:
+                return
+            self._appends_since_rewrite += 1
+            if self._appends_since_rewrite >= self.max_entries:
+                self._queue_rewrite()
+            else:
+                self._pending_writes.put((False, [(vector, scope, response, stored_at)]))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._lru.clear()
+            if self.path:
+                self._queue_rewrite()
+
+    def _live_records(self):
+        """Unexpired entries as (vector, scope, response, stored_at), least recently used first."""
+        now = time.time()
+        return [
+            (self._vectors[slot].copy(), *self._entries[slot])  # copied: the slot may be reused
+            for slot in self._lru
+            if not self._expired(self._entries[slot][2], now)
+        ]
+
+    def _queue_rewrite(self) -> None:
+        # Called with the lock held, so the snapshot is ordered after every queued append.
+        self._pending_writes.put((True, self._live_records()))
+        self._appends_since_rewrite = 0
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - stored_at > self.ttl_seconds
+
+    def _insert(self, vector: np.ndarray, scope: str, response: str, stored_at: float) -> None:
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            # First entry, or the embedding model changed: older vectors are not comparable.
+            self._vectors = np.empty((self.max_entries, vector.shape[0]), dtype=np.float32)
+            self._entries.clear()
+            self._lru.clear()
+        if len(self._entries) < self.max_entries:
+            slot = len(self._entries)
+            self._entries.append((scope, response, stored_at))
+        else:
+            slot, _ = self._lru.popitem(last=False)
+            self._entries[slot] = (scope, response, stored_at)
+        self._vectors[slot] = vector
+        self._lru[slot] = None
+
+    def _load(self) -> None:
+        """Replays the file left by earlier processes, then rewrites it with only what was kept."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("Could not read semantic cache file %s: %s", self.path, e)
+            return
+
+        now = time.time()
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+                vector = np.frombuffer(base64.b64decode(record["vector"]), dtype=np.float32)
+                entry = (vector, record["scope"], record["response"], float(record["stored_at"]))
+            except (ValueError, KeyError, TypeError):
+                continue  # e.g. a line cut short when the previous process stopped
+            if not self._expired(entry[3], now):
+                records.append(entry)
+
+        for vector, scope, response, stored_at in records[-self.max_entries:]:
+            self._insert(vector, scope, response, stored_at)
+        self._write(self._live_records(), rewrite=True)
+        logger.info("Loaded %d semantic cache entries from %s", len(self._entries), self.path)
+
+    def _write_pending(self) -> None:
+        while True:
+            rewrite, records = self._pending_writes.get()
+            self._write(records, rewrite)
+
+    def _write(self, records, rewrite: bool) -> None:
+        lines = [_encode_record(*record) for record in records]
+        try:
+            if rewrite:
+                # Write a new file and swap it in, so a crash mid-write leaves the old one intact.
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+                os.replace(tmp_path, self.path)
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+        except OSError as e:
+            logger.warning("Could not write semantic cache file %s: %s", self.path, e)
+
+
+def _encode_record(vector: np.ndarray, scope: str, response: str, stored_at: float) -> str:
+    return json.dumps({
+        "vector": base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii"),
+        "scope": scope,
+        "response": response,
+        "stored_at": stored_at,
+    }) + "\n"
+
+
+def dated_scope(scope: str = "") -> str:
+    """
+    Prefixes a cache scope with today's date on the agents' clock (Cranford, NJ). Answers can
+    depend on the date they were given ("what's on today?"), so they are only reused that day.
+    """
+    return f"{get_current_datetime_cranford().split(' at ')[0]}\n{scope}"
+
+
+def cached_answer(cache: SemanticCache, text: str, scope: str) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """
+    Embeds `text` and looks it up in `cache`, returning (vector, answer). On any failure, e.g. the
+    embedding API being down, the error is logged and (None, None) returned: the caller runs the
+    agent as if the cache were off.
+    """
+    try:
+        vector = cache.embed(text)
+        return vector, cache.lookup(vector, scope)
+    except Exception:
+        logger.exception("Semantic cache lookup failed; answering without the cache")
+        return None, None
+
+
+def remember_answer(cache: SemanticCache, vector: Optional[np.ndarray], scope: str, answer: str,
+                    memories_changed: bool) -> None:
+    """
+    Stores an agent answer, or clears the cache when the turn changed memories (earlier answers
+    may now be wrong). Nothing is stored without a vector. Errors are logged, not raised.
+    """
+    try:
+        if memories_changed:
+            cache.invalidate()
+        elif vector is not None:
+            cache.store(vector, answer, scope)
+    except Exception:
+        logger.exception("Could not update the semantic cache")
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Returns the process-wide response cache, or None when SEMANTIC_CACHE_ENABLED is off."""
+    if not app_env.SEMANTIC_CACHE_ENABLED:
+        return None
+    return SemanticCache(
+        threshold=app_env.SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+        max_entries=app_env.SEMANTIC_CACHE_MAX_ENTRIES,
+        path=app_env.SEMANTIC_CACHE_PATH,
+        ttl_seconds=app_env.SEMANTIC_CACHE_TTL_SECONDS,
+    )
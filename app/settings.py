@@ -13,4 +13,4 @@
 
 GRAPH_DB_PROVIDER = "neo4j"  # Options: "neo4j", "none"
 VECTOR_STORE_PROVIDER = "supabase"  # Options: "supabase", "none", "pinecone", etc.
-# LLM_PROVIDER = "openai" # Example for future
+LLM_PROVIDER = "openai"  # Options: "openai", "openrouter", "togetherai", "groq"
@@ -1,7 +1,10 @@
 import re
-from app.adapters.embedder_adapter import embedder
+from app.adapters.embedder_adapter import get_embedder
 from app.data_source_manager import get_graph_db_instance
 
+_NON_WORD_RE = re.compile(r"[^\w]+")
+_MULTI_UNDERSCORE_RE = re.compile(r"_+")
+
 
 def _search_source_node(source_embedding, user_id, threshold=0.9):
     graph_db_service = get_graph_db_instance()
@@ -75,11 +78,11 @@ def sanitize_string(s):
     # Lowercase the string
     s = s.lower()
     # Replace invalid characters with underscores
-    s = re.sub(r"[^\w]+", "_", s)
+    s = _NON_WORD_RE.sub("_", s)
     # Remove leading or trailing underscores
     s = s.strip("_")
     # Replace multiple underscores with a single underscore
-    s = re.sub(r"_+", "_", s)
+    s = _MULTI_UNDERSCORE_RE.sub("_", s)
     return s
 
 
@@ -98,8 +101,8 @@ def add_entities(to_be_added, user_id, entity_type_map):
         destination_type = entity_type_map.get(destination, "unknown")
 
         # embeddings
-        source_embedding = embedder.embed_query(source)
-        dest_embedding = embedder.embed_query(destination)
+        source_embedding = get_embedder().embed_query(source)
+        dest_embedding = get_embedder().embed_query(destination)
 
         # search for the nodes with the closest embeddings
         source_node_search_result = _search_source_node(source_embedding, user_id, threshold=0.9)
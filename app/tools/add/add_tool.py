@@ -1,3 +1,4 @@
+import asyncio
 from app.tools.shared_utils.retrieve_nodes_from_data import retrieve_nodes_from_data
 from app.tools.shared_utils.establish_nodes_relations_from_data import establish_nodes_relations_from_data
 from app.tools.add.add_entities import add_entities
@@ -61,4 +62,4 @@ class AddGraphMemoryTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ):
         """Use the tool asynchronously."""
-        return add(data, app_env.APP_USERNAME)
+        return await asyncio.to_thread(add, data, app_env.APP_USERNAME)
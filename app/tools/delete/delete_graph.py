@@ -1,9 +1,10 @@
-import json
+import orjson
 from app.data_source_manager import get_graph_db_instance
-from app.adapters.llm_adapter import search_llm_provider
+from app.adapters.llm_adapter import get_search_llm
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from typing import Literal
+from functools import lru_cache
 
 
 DeleteType = Literal["source", "relationship"]
@@ -52,21 +53,21 @@ def format_entities(entities):
 
     formatted_lines = []
     for entity in entities:
-        simplified = json.dumps({
+        simplified = orjson.dumps({
             "source": entity["source"],
             "relationship": entity.get("relationship") or entity.get("relatationship", ""),
             "destination": entity["destination"],
             "source_id": entity["source_id"],
             "relation_id": entity["relation_id"],
             "destination_id": entity["destination_id"],
-        }, ensure_ascii=False)  # Keep Unicode characters if needed
+        }).decode()  # orjson emits UTF-8, so Unicode characters are kept as-is
         formatted_lines.append(simplified)
 
     return "\n".join(formatted_lines)
 
 
-def get_delete_prompts(existing_memories_string, data, user_id):
-    system_prompt = """
+# Built once at import. The doubled braces are ChatPromptTemplate escapes, so leave them as-is.
+_DELETE_SYSTEM_PROMPT = """
         You are an assistant that extracts structured delete information from user instructions.
         Your task is to determine what type of data needs to be deleted and the correct entity ID 
         (source_id or relation_id).
@@ -102,7 +103,11 @@ def get_delete_prompts(existing_memories_string, data, user_id):
             "delete_type": "relationship",
             "entity_id": "5:c788121e-e836-411f-a0e4-011356079d19:1152929201188241408"
         }}
-    """.replace("USER_ID", user_id)
+    """
+
+
+def get_delete_prompts(existing_memories_string, data, user_id):
+    system_prompt = _DELETE_SYSTEM_PROMPT.replace("USER_ID", user_id)
 
     human_message = f"Here are the existing memories: {existing_memories_string} \n\n Latest user request: {data}"
 
@@ -116,6 +121,12 @@ class DeleteGraphMemory(BaseModel):
     entity_id: str = Field(..., description="The corresponding entity ID")
 
 
+@lru_cache(maxsize=1)
+def _get_structured_llm():
+    """Cached structured LLM for delete decisions."""
+    return get_search_llm().with_structured_output(DeleteGraphMemory)
+
+
 def process_and_delete(search_output, data, user_id):
     """Get the entities to be deleted from the search output."""
     search_output_string = format_entities(search_output)
@@ -128,7 +139,7 @@ def process_and_delete(search_output, data, user_id):
         ]
     )
 
-    structured_llm = search_llm_provider.with_structured_output(DeleteGraphMemory)
+    structured_llm = _get_structured_llm()
     few_shot_structured_llm = prompt | structured_llm
     delete_decision = few_shot_structured_llm.invoke({"user_prompt": user_prompt})
     delete_decision_json = delete_decision.model_dump()
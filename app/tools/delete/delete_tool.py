@@ -1,3 +1,4 @@
+import asyncio
 from app.tools.shared_utils.retrieve_nodes_from_data import retrieve_nodes_from_data
 from app.tools.shared_utils.search_graph_db import search_graph_db
 from app.tools.shared_utils.get_deleted_entities import get_delete_entities_from_search_output
@@ -70,5 +71,5 @@ class DeleteGraphMemoryTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ):
         """Use the tool asynchronously."""
-        return delete(data, vector_store_doc_ids, app_env.APP_USERNAME)
+        return await asyncio.to_thread(delete, data, vector_store_doc_ids, app_env.APP_USERNAME)
     
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional, Type
 from langchain_core.tools import tool
 from langchain.callbacks.manager import (
@@ -32,7 +33,7 @@ class SearchForDocumentSnippetsTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Use the tool asynchronously."""
-        return search_by_embedding(query)
+        return await asyncio.to_thread(search_by_embedding, query)
 
 
 @tool
@@ -64,7 +65,7 @@ class SearchForDocumentsTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Use the tool asynchronously."""
-        return search_for_all_documents(query)
+        return await asyncio.to_thread(search_for_all_documents, query)
 
 
 @tool
@@ -1,3 +1,4 @@
+import asyncio
 from app.logger import app_logger as logger
 from app.data_source_manager import get_graph_db_instance
 from app.app_env import app_env
@@ -79,5 +80,5 @@ class GetAllMemoryItemsTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ):
         """Use the tool asynchronously."""
-        return get_all(app_env.APP_USERNAME)
+        return await asyncio.to_thread(get_all, app_env.APP_USERNAME)
     
\ No newline at end of file
@@ -1,4 +1,5 @@
-import json
+import asyncio
+import orjson
 import time
 import concurrent.futures
 from app.tools.shared_utils.search_graph_db import search_graph_db_by_query
@@ -117,7 +118,7 @@ def search(query: str, user_id: str, limit: int = 100) -> str:
     
     # Format the results
     format_start = time.time()
-    combined_search_results = json.dumps(search_results) if len(search_results) else ""
+    combined_search_results = orjson.dumps(search_results).decode() if len(search_results) else ""
     
     final_output = (
         f"**Knowledge graph data:** [{combined_search_results}]\n"
@@ -174,7 +175,7 @@ class SearchForMemoryItemsTool(BaseTool):
         """Use the tool asynchronously."""
         print(f"Running async SearchForMemoryItemsTool with query: '{query}'")
         start_time = time.time()
-        result = search(query, app_env.APP_USERNAME)
+        result = await asyncio.to_thread(search, query, app_env.APP_USERNAME)
         total_time = time.time() - start_time
         print(f"Async SearchForMemoryItemsTool completed in {total_time:.3f}s")
         return result
@@ -1,9 +1,10 @@
-from app.adapters.llm_adapter import llm_provider
+from app.adapters.llm_adapter import get_llm
 from app.logger import app_logger as logger
 from pydantic import BaseModel, Field
 from typing import List
 from app.tools.shared_utils.prompts import EXTRACT_RELATIONS_PROMPT
 from langchain_core.prompts import ChatPromptTemplate
+from functools import lru_cache
 
 
 class EntityItem(BaseModel):
@@ -28,6 +29,12 @@ def _remove_spaces_from_entities(entity_list):
     return entity_list
 
 
+@lru_cache(maxsize=1)
+def _get_structured_llm():
+    """Relation-extraction LLM; schema conversion happens once per process."""
+    return get_llm().with_structured_output(EstablishRelations)
+
+
 def establish_nodes_relations_from_data(data, user_id, entity_type_map):
     """Establish relations among the extracted nodes."""
     prompt = ChatPromptTemplate.from_messages(
@@ -40,7 +47,7 @@ def establish_nodes_relations_from_data(data, user_id, entity_type_map):
         ]
     )
 
-    structured_llm = llm_provider.with_structured_output(EstablishRelations)
+    structured_llm = _get_structured_llm()
     few_shot_structured_llm = prompt | structured_llm
     extracted_entities_response = few_shot_structured_llm.invoke({"entries_list": list(entity_type_map.keys()), "data": data})
 
@@ -1,8 +1,9 @@
 from app.tools.shared_utils.prompts import DELETE_RELATIONS_SYSTEM_PROMPT
-from app.adapters.llm_adapter import search_llm_provider
+from app.adapters.llm_adapter import get_search_llm
 from app.logger import app_logger as logger
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
+from functools import lru_cache
 
 
 def get_delete_messages(existing_memories_string, data, user_id):
@@ -39,6 +40,12 @@ class DeleteGraphMemory(BaseModel):
     destination: str = Field(..., description="The identifier of the destination node in the relationship.")
 
 
+@lru_cache(maxsize=1)
+def _get_structured_llm():
+    """Structured LLM for picking relationships to delete (built once)."""
+    return get_search_llm().with_structured_output(DeleteGraphMemory)
+
+
 def get_delete_entities_from_search_output(search_output, data, user_id):
     """Get the entities to be deleted from the search output."""
     search_output_string = format_entities(search_output)
@@ -50,7 +57,7 @@ def get_delete_entities_from_search_output(search_output, data, user_id):
             ("user", "{user_prompt}")
         ]
     )
-    structured_llm = search_llm_provider.with_structured_output(DeleteGraphMemory)
+    structured_llm = _get_structured_llm()
     few_shot_structured_llm = prompt | structured_llm
     memory_updates = few_shot_structured_llm.invoke({"user_prompt": user_prompt})
     memory_updates_json = memory_updates.model_dump()
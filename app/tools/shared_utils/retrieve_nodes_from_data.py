@@ -1,8 +1,9 @@
-from app.adapters.llm_adapter import search_llm_provider
+from app.adapters.llm_adapter import get_search_llm
 from app.logger import app_logger as logger
 from pydantic import BaseModel, Field
 from typing import List
 from langchain_core.prompts import ChatPromptTemplate
+from functools import lru_cache
 
 
 class EntityItem(BaseModel):
@@ -18,6 +19,12 @@ class ExtractEntities(BaseModel):
     entities: List[EntityItem]
 
 
+@lru_cache(maxsize=1)
+def _get_structured_llm():
+    """Entity-extraction LLM, bound to its output schema on first use."""
+    return get_search_llm().with_structured_output(ExtractEntities)
+
+
 def retrieve_nodes_from_data(data, user_id):
     """Extracts all the entities mentioned in the query."""
     prompt = ChatPromptTemplate.from_messages(
@@ -45,7 +52,7 @@ def retrieve_nodes_from_data(data, user_id):
         ]
     )
 
-    structured_llm = search_llm_provider.with_structured_output(ExtractEntities)
+    structured_llm = _get_structured_llm()
     few_shot_structured_llm = prompt | structured_llm
     search_results = few_shot_structured_llm.invoke({"user_input": data})
 
@@ -1,4 +1,4 @@
-from app.adapters.embedder_adapter import embedder
+from app.adapters.embedder_adapter import get_embedder
 from app.data_source_manager import get_graph_db_instance
 import time
 import concurrent.futures
@@ -77,7 +77,7 @@ def search_graph_db(node_list, user_id, limit=10):
     print(f"Node list: ${node_list}")
 
     params = {
-        "embeddings": [embedder.embed_query(n) for n in node_list],
+        "embeddings": [get_embedder().embed_query(n) for n in node_list],
         "neighboursPerEmb": limit * 2,
         "limit": limit,
         "user_id": user_id,
@@ -99,7 +99,7 @@ def search_graph_db_by_query(query: str, user_id: str, limit=20):
     result_relations = []
 
     params = {
-        "n_embedding": embedder.embed_query(query),
+        "n_embedding": get_embedder().embed_query(query),
         "neighboursPerEmb": limit * 2,
         "limit": limit,
         "user_id": user_id,
@@ -119,7 +119,7 @@ def parallel_search_graph_db(node_list, user_id, limit=10):
     
     # Compute embeddings (still potentially a bottleneck)
     embedding_start = time.time()
-    node_embeddings = {node: embedder.embed_query(node) for node in node_list}
+    node_embeddings = {node: get_embedder().embed_query(node) for node in node_list}
     embedding_time = time.time() - embedding_start
     
     # Prepare query jobs
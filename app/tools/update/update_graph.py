@@ -1,9 +1,10 @@
-import json
+import orjson
 from app.data_source_manager import get_graph_db_instance
-from app.adapters.llm_adapter import search_llm_provider
+from app.adapters.llm_adapter import get_search_llm
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from typing import Literal
+from functools import lru_cache
 
 UpdateType = Literal["source", "relationship", "destination"]
 
@@ -52,21 +53,21 @@ def format_entities(entities):
 
     formatted_lines = []
     for entity in entities:
-        simplified = json.dumps({
+        simplified = orjson.dumps({
             "source": entity["source"],
             "relationship": entity.get("relationship") or entity.get("relatationship", ""),
             "destination": entity["destination"],
             "source_id": entity["source_id"],
             "relation_id": entity["relation_id"],
             "destination_id": entity["destination_id"],
-        }, ensure_ascii=False)  # Keep Unicode characters if needed
+        }).decode()  # orjson emits UTF-8, so Unicode characters are kept as-is
         formatted_lines.append(simplified)
 
     return "\n".join(formatted_lines)
 
 
-def get_update_messages(existing_memories_string, data, user_id):
-    system_prompt = """
+# Static template: braces are doubled for ChatPromptTemplate; only USER_ID is substituted per call.
+_UPDATE_SYSTEM_PROMPT = """
         You are an assistant that extracts structured update information from user instructions. 
         Your task is to determine what type of data needs to be updated, the new value
         and the correct entity ID (source_id, relation_id, or destination_id).
@@ -115,7 +116,11 @@ def get_update_messages(existing_memories_string, data, user_id):
             "new_value": "Ben",
             "entity_id": "4:c788121e-e836-411f-a0e4-011356079d19:1"
         }}
-    """.replace("USER_ID", user_id)
+    """
+
+
+def get_update_messages(existing_memories_string, data, user_id):
+    system_prompt = _UPDATE_SYSTEM_PROMPT.replace("USER_ID", user_id)
 
     human_message = f"Here are the existing memories: {existing_memories_string} \n\n Latest user request: {data}"
 
@@ -130,6 +135,12 @@ class UpdateGraphMemory(BaseModel):
     entity_id: str = Field(..., description="The corresponding entity ID")
 
 
+@lru_cache(maxsize=1)
+def _get_structured_llm():
+    """Structured LLM for update decisions, cached to skip re-binding the schema."""
+    return get_search_llm().with_structured_output(UpdateGraphMemory)
+
+
 def process_and_update(search_output, data, user_id):
     """Get the entities to be deleted from the search output."""
     search_output_string = format_entities(search_output)
@@ -141,7 +152,7 @@ def process_and_update(search_output, data, user_id):
             ("user", "{user_prompt}")
         ]
     )
-    structured_llm = search_llm_provider.with_structured_output(UpdateGraphMemory)
+    structured_llm = _get_structured_llm()
     few_shot_structured_llm = prompt | structured_llm
     memory_updates = few_shot_structured_llm.invoke({"user_prompt": user_prompt})
     memory_updates_json = memory_updates.model_dump()
@@ -1,3 +1,4 @@
+import asyncio
 from app.tools.shared_utils.retrieve_nodes_from_data import retrieve_nodes_from_data
 from app.tools.shared_utils.search_graph_db import search_graph_db
 from app.tools.shared_utils.get_deleted_entities import get_delete_entities_from_search_output
@@ -76,4 +77,4 @@ class UpdateGraphMemoryTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ):
         """Use the tool asynchronously."""
-        return update(data, doc_ids, app_env.APP_USERNAME)
+        return await asyncio.to_thread(update, data, doc_ids, app_env.APP_USERNAME)